@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+import time
+from tests.helpers import (FakeOllamaServer, render_synthetic_screen, render_labelled_screen,
+                           render_container_screen, box_iou)
+
+def benchmark_workflow_generation(num_prompts=64, latency=0.05):
+    """Compare sequential and batched workflow generation in prompts/sec"""
+    from src.ai.gemma import GemmaWorkflowGenerator
+
+    print(f"Workflow generation: {num_prompts} prompts, {latency * 1000:.0f}ms simulated latency")
+    prompts = [f"Play song number {i} on Spotify" for i in range(num_prompts)]
+
+    with FakeOllamaServer(latency=latency) as server:
+        generator = GemmaWorkflowGenerator(ollama_url=server.url)
+        start = time.perf_counter()
+        for prompt in prompts:
+            generator.generate_workflow(prompt)
+        elapsed = time.perf_counter() - start
+        print(f"  sequential:        {num_prompts / elapsed:8.1f} prompts/sec")
+
+        for workers in (4, 16):
+            generator = GemmaWorkflowGenerator(ollama_url=server.url, max_concurrency=workers)
+            start = time.perf_counter()
+            results = list(generator.generate_workflows(prompts))
+            elapsed = time.perf_counter() - start
+            print(f"  batch, {workers:2d} workers: {len(results) / elapsed:8.1f} prompts/sec")
+
+        # Half the batch is duplicates, which should collapse into single requests
+        server.request_count = 0
+        duplicated = prompts[:num_prompts // 2] * 2
+        list(generator.generate_workflows(duplicated))
+        print(f"  deduplicated: {len(duplicated)} prompts -> {server.request_count} requests")
+
+def legacy_detect_clickable_elements(image):
+    """Previous detector: contours on the unthresholded grayscale image"""
+    import cv2
+
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    contours, _ = cv2.findContours(gray, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    elements = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if w > 50 and h > 20:
+            elements.append({'bounds': (x, y, w, h), 'type': 'clickable', 'confidence': 0.8})
+    return elements
+
+def benchmark_clickable_detection(num_screens=20):
+    """Measure candidate count, latency and button recall of the clickable detector"""
+    from src.ai.vision import VisualProcessor
+
+    processor = VisualProcessor()
+    screen_sets = [
+        ("textured", [render_synthetic_screen(seed) for seed in range(num_screens)]),
+        ("sparse", [render_labelled_screen(["Search", "Play", "Send", "Cancel"][:n % 4 + 1])
+                    for n in range(num_screens)]),
+        ("nested", [render_container_screen(("dialog", "toolbar")[n % 2]) for n in range(num_screens)])
+    ]
+    detectors = [
+        ("legacy", legacy_detect_clickable_elements),
+        ("current", processor._detect_clickable_elements)
+    ]
+
+    print(f"Clickable detection: {num_screens} synthetic 1280x800 screens per set")
+    for set_name, screens in screen_sets:
+        for name, detect in detectors:
+            candidates, found, total, elapsed = 0, 0, 0, 0.0
+            for screen, buttons in screens:
+                start = time.perf_counter()
+                elements = detect(screen)
+                elapsed += time.perf_counter() - start
+
+                candidates += len(elements)
+                total += len(buttons)
+                found += sum(any(box_iou(button, e['bounds']) > 0.5 for e in elements) for button in buttons)
+
+            print(f"  {set_name:8s} {name:8s} {candidates / num_screens:8.1f} candidates/screen, "
+                  f"{elapsed / num_screens * 1000:6.1f} ms/screen, recall {found / total:.2f}")
+
+def run_pool_workload(workers, num_workflows):
+    """Run one pool size and report its throughput and memory, in the calling process"""
+    import contextlib
+    import io
+    import resource
+    from src.core.pool import AutomationPool
+    from src.core.desktop import SimulatedDesktop
+    from src.core.types import WorkflowStep, ActionType
+
+    workflow = [
+        WorkflowStep(ActionType.CLICK, "Search button"),
+        WorkflowStep(ActionType.TYPE, "search input", value="cello music"),
+        WorkflowStep(ActionType.ENTER, "submit search"),
+        WorkflowStep(ActionType.CLICK, "Play button")
+    ]
+
+    desktops = [SimulatedDesktop(latency=0.05) for _ in range(workers)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        pool = AutomationPool(desktops, step_delay=0.05)
+        # Load the shared embedding model before measuring worker overhead
+        cache = pool.engines[0].element_matcher.semantic_matcher.cache
+        baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        start = time.perf_counter()
+        futures = [pool.submit(workflow) for _ in range(num_workflows)]
+        succeeded = sum(future.result() for future in futures)
+        elapsed = time.perf_counter() - start
+        pool.shutdown()
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        'workflows_per_hour': num_workflows / elapsed * 3600,
+        'succeeded': succeeded,
+        'cache_hit_rate': cache.hits / max(1, cache.hits + cache.misses),
+        'baseline_mb': baseline_kb / 1024,
+        'peak_mb': peak_kb / 1024
+    }
+
+def benchmark_automation_pool(num_workflows=24, worker_counts=(1, 2, 4, 8)):
+    """Measure workflows/hour and per-worker memory as the pool grows"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    print(f"Automation pool: {num_workflows} workflows on simulated desktops")
+    for workers in worker_counts:
+        # A fresh process per pool size, since peak RSS never goes down within one
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            result = executor.submit(run_pool_workload, workers, num_workflows).result()
+
+        per_worker = (result['peak_mb'] - result['baseline_mb']) / workers
+        print(f"  {workers} workers: {result['workflows_per_hour']:9.0f} workflows/hour, "
+              f"{result['succeeded']}/{num_workflows} succeeded, "
+              f"{result['cache_hit_rate']:.0%} embedding cache hits, "
+              f"peak {result['peak_mb']:.0f} MB ({result['baseline_mb']:.0f} MB with shared models, "
+              f"+{per_worker:.1f} MB/worker)")
+
+if __name__ == "__main__":
+    benchmark_workflow_generation()
+    benchmark_clickable_detection()
+    benchmark_automation_pool()
@@ -1,16 +1,99 @@
 import requests
 import json
-from typing import List
+import random
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Tuple
+from requests.adapters import HTTPAdapter
 from ..core.types import WorkflowStep, ActionType
 
+# Status codes worth retrying: Ollama returns these while a model is loading or overloaded
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+
 class GemmaWorkflowGenerator:
     """Uses local Ollama Gemma model to generate workflows from natural language prompts"""
     
-    def __init__(self, ollama_url="http://localhost:11434"):
+    def __init__(self, ollama_url="http://localhost:11434", max_concurrency=4,
+                 max_retries=3, backoff_base=0.5):
         self.ollama_url = ollama_url
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        
+        # Pooled keep-alive session shared by all requests, sized for the batch workers
+        self.session = requests.Session()
+        self._pool_size = 0
+        self._pool_lock = threading.Lock()
+        self._ensure_pool_size(max_concurrency)
+        
+        # Prompts currently being generated, so identical requests share one call
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.RLock()
         
     def generate_workflow(self, prompt: str) -> List[WorkflowStep]:
         """Generate structured workflow from user prompt"""
+        full_prompt = self._build_prompt(prompt)
+        
+        response = self._call_ollama(full_prompt)
+        workflow_json = self._extract_json(response)
+        
+        return self._parse_workflow(workflow_json)
+    
+    def generate_workflows(self, prompts: Iterable[str],
+                           max_concurrency: int = None) -> Iterator[Tuple[str, List[WorkflowStep]]]:
+        """Generate workflows for many prompts concurrently.
+        
+        Yields (prompt, workflow) pairs as they complete. Duplicate prompts, in this
+        batch or already in flight from another batch, share a single Ollama request
+        and are yielded once.
+        """
+        workers = max_concurrency or self.max_concurrency
+        self._ensure_pool_size(workers)
+        futures = {}
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for prompt in prompts:
+                if prompt not in futures:
+                    futures[prompt] = self._submit_single_flight(executor, prompt)
+            
+            pending = {future: prompt for prompt, future in futures.items()}
+            for future in as_completed(pending):
+                try:
+                    workflow = future.result()
+                except Exception as e:
+                    # One bad prompt shouldn't lose the rest of the batch
+                    print(f"Workflow generation failed for {pending[future]!r}: {e}")
+                    workflow = []
+                yield pending[future], workflow
+    
+    def _ensure_pool_size(self, size: int):
+        """Grow the session's connection pool so every worker keeps its connection alive"""
+        with self._pool_lock:
+            if size <= self._pool_size:
+                return
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+            self._pool_size = size
+    
+    def _submit_single_flight(self, executor: ThreadPoolExecutor, prompt: str) -> Future:
+        """Return the in-flight future for prompt, starting a new request if there is none"""
+        with self._inflight_lock:
+            future = self._inflight.get(prompt)
+            if future is None:
+                future = executor.submit(self.generate_workflow, prompt)
+                self._inflight[prompt] = future
+                future.add_done_callback(lambda _: self._finish_flight(prompt, future))
+            return future
+    
+    def _finish_flight(self, prompt: str, future: Future):
+        with self._inflight_lock:
+            if self._inflight.get(prompt) is future:
+                del self._inflight[prompt]
+    
+    def _build_prompt(self, prompt: str) -> str:
+        """Wrap user prompt with the workflow system prompt"""
         system_prompt = """You are a desktop automation assistant. Convert user requests into JSON workflows for UI automation.
 
 Rules:
@@ -34,38 +117,47 @@ User: "Open Spotify and play music"
 
 User request:"""
 
-        full_prompt = f"{system_prompt} {prompt}\n\nJSON:"
-        
-        response = self._call_ollama(full_prompt)
-        workflow_json = self._extract_json(response)
-        
-        return self._parse_workflow(workflow_json)
+        return f"{system_prompt} {prompt}\n\nJSON:"
     
     def _call_ollama(self, prompt: str) -> str:
-        """Call local Ollama API"""
-        try:
-            response = requests.post(
-                f"{self.ollama_url}/api/generate",
-                json={
-                    "model": "gemma2:2b",
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.1,
-                        "num_predict": 200
-                    }
-                },
-                timeout=30
-            )
+        """Call local Ollama API, retrying transient failures with jittered exponential backoff"""
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                # Jitter so workers that failed together don't all retry together
+                delay = self.backoff_base * (2 ** (attempt - 1))
+                time.sleep(delay * random.uniform(0.5, 1.5))
+            try:
+                response = self.session.post(
+                    f"{self.ollama_url}/api/generate",
+                    json={
+                        "model": "gemma2:2b",
+                        "prompt": prompt,
+                        "stream": False,
+                        "options": {
+                            "temperature": 0.1,
+                            "num_predict": 200
+                        }
+                    },
+                    timeout=30
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                print(f"Failed to connect to Ollama: {e}")
+                continue
+            except Exception as e:
+                print(f"Failed to connect to Ollama: {e}")
+                return ""
             
             if response.status_code == 200:
-                return response.json().get("response", "")
-            else:
-                print(f"Ollama API error: {response.status_code}")
+                try:
+                    return response.json().get("response", "")
+                except ValueError:
+                    return ""
+            
+            print(f"Ollama API error: {response.status_code}")
+            if response.status_code not in TRANSIENT_STATUS_CODES:
                 return ""
-        except Exception as e:
-            print(f"Failed to connect to Ollama: {e}")
-            return ""
+        
+        return ""
     
     def _extract_json(self, response: str) -> str:
         """Extract JSON from model response"""
@@ -92,5 +184,5 @@ User request:"""
                 steps.append(step)
             
             return steps
-        except (json.JSONDecodeError, KeyError, ValueError):
+        except (json.JSONDecodeError, KeyError, ValueError, TypeError, AttributeError):
             return []
\ No newline at end of file
@@ -1,26 +1,73 @@
+import threading
+from collections import OrderedDict
 import torch
 from transformers import AutoTokenizer, AutoModel
 import numpy as np
-from typing import Dict
+from typing import Dict, Optional
+from ..core.resources import ResourceManager, get_resource_manager
+
+class EmbeddingCache:
+    """Thread-safe LRU of text embeddings, shared by every engine using one matcher"""
+    
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, text: str) -> Optional[np.ndarray]:
+        with self._lock:
+            embedding = self._entries.get(text)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(text)
+            self.hits += 1
+            return embedding
+    
+    def put(self, text: str, embedding: np.ndarray):
+        # Cached arrays are handed to every caller, so none of them may modify it
+        embedding.setflags(write=False)
+        with self._lock:
+            self._entries[text] = embedding
+            self._entries.move_to_end(text)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
 
 class SemanticMatcher:
     """Matches semantic descriptions to UI elements using embeddings"""
     
-    def __init__(self):
+    def __init__(self, resource_manager: ResourceManager = None, cache_size: int = 4096):
         self.tokenizer = AutoTokenizer.from_pretrained('sentence-transformers/all-MiniLM-L6-v2')
         self.model = AutoModel.from_pretrained('sentence-transformers/all-MiniLM-L6-v2')
+        self.resource_manager = resource_manager or get_resource_manager()
+        self.cache = EmbeddingCache(cache_size)
     
     def encode_text(self, text: str) -> np.ndarray:
-        """Convert text to embedding vector"""
+        """Convert text to embedding vector, reusing earlier encodings of the same text"""
+        embedding = self.cache.get(text)
+        if embedding is None:
+            embedding = self.resource_manager.run('embedding', self._encode, text)
+            self.cache.put(text, embedding)
+        return embedding
+    
+    def _encode(self, text: str) -> np.ndarray:
         inputs = self.tokenizer(text, return_tensors='pt', padding=True, truncation=True)
         with torch.no_grad():
             outputs = self.model(**inputs)
             embeddings = outputs.last_hidden_state.mean(dim=1)
         return embeddings.numpy().flatten()
     
-    def calculate_similarity(self, description: str, element_text: str, element_type: str) -> float:
+    def calculate_similarity(self, description: str, element_text: str, element_type: str,
+                             desc_embedding: np.ndarray = None) -> float:
         """Calculate semantic similarity between description and UI element"""
-        desc_embedding = self.encode_text(description)
+        if desc_embedding is None:
+            desc_embedding = self.encode_text(description)
         
         # Combine element text and type for better matching
         element_context = f"{element_type} {element_text}".strip()
@@ -3,6 +3,7 @@ import torch.nn as nn
 import cv2
 import numpy as np
 from typing import List, Dict
+from ..core.resources import ResourceManager, get_resource_manager
 
 class LayoutCNN(nn.Module):
     """CNN model for understanding UI layout and detecting elements"""
@@ -30,23 +31,28 @@ class LayoutCNN(nn.Module):
 class VisualProcessor:
     """Process screenshots to extract UI elements"""
     
-    def __init__(self):
+    def __init__(self, max_candidates=50, resource_manager: ResourceManager = None):
         self.layout_model = LayoutCNN()
         # In practice, load pre-trained weights
+        self.max_candidates = max_candidates
+        self.resource_manager = resource_manager or get_resource_manager()
+        self._morph_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
         
     def extract_elements(self, screenshot: np.ndarray) -> List[Dict]:
         """Extract UI elements from screenshot"""
         # Preprocess image
         processed = self._preprocess_image(screenshot)
         
-        # Detect text regions using OCR
-        text_regions = self._extract_text_regions(screenshot)
-        
-        # Detect clickable elements using computer vision
-        clickable_regions = self._detect_clickable_elements(screenshot)
+        # Detect text regions using OCR and clickable elements using computer vision,
+        # side by side since they only share the input frame
+        text_future = self.resource_manager.submit('ocr', self._extract_text_regions, screenshot)
+        clickable_future = self.resource_manager.submit('detect', self._detect_clickable_elements, screenshot)
+        text_regions = text_future.result()
+        clickable_regions = clickable_future.result()
         
         # Combine and classify all regions
-        all_elements = self._combine_and_classify(text_regions, clickable_regions, screenshot)
+        all_elements = self.resource_manager.run('cnn', self._combine_and_classify,
+                                                 text_regions, clickable_regions, screenshot)
         
         return all_elements
     
@@ -80,23 +86,70 @@ class VisualProcessor:
     
     def _detect_clickable_elements(self, image: np.ndarray) -> List[Dict]:
         """Detect buttons, links, and other clickable elements"""
-        # Use computer vision techniques
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        height, width = gray.shape
+        
+        # Edges catch bordered controls, adaptive threshold catches flat filled ones
+        edges = cv2.Canny(gray, 50, 150)
+        filled = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C,
+                                       cv2.THRESH_BINARY_INV, 15, 10)
+        mask = cv2.bitwise_or(edges, cv2.morphologyEx(filled, cv2.MORPH_GRADIENT, self._morph_kernel))
+        
+        # Close small gaps so each control outline is unbroken, then trace the flat
+        # regions those outlines enclose; a button interior is one such region
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self._morph_kernel)
+        contours, hierarchy = cv2.findContours(cv2.bitwise_not(mask), cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+        if not contours:
+            return []
+        
+        # Vectorized filtering over contour bounding boxes
+        x, y, w, h = np.array([cv2.boundingRect(c) for c in contours], dtype=np.float32).T
+        candidate = ((w > 50) & (h > 20) &  # Filter small regions
+                     (w < 0.9 * width) & (h < 0.5 * height) &  # Filter panels and backgrounds
+                     (w < 15 * h))
+        
+        # Keep outer region boundaries, not holes; their area ignores holes left by labels
+        area = np.zeros(len(contours), dtype=np.float32)
+        for i in np.flatnonzero(candidate):
+            area[i] = -cv2.contourArea(contours[i], oriented=True)
+        candidate &= area > 0
+        
+        # A region's parent is the enclosing region's hole, whose parent is that region
+        parent = hierarchy[0][:, 3]
+        grandparent = np.where(parent >= 0, parent[parent], -1)
+        nested = candidate & (grandparent >= 0) & candidate[np.maximum(grandparent, 0)]
+        enclosing = grandparent[nested]
+        
+        # A lone child covering much of its parent is a piece of the same control (e.g. the
+        # interior split off by label text); otherwise the parent is a container of controls
+        children = np.bincount(enclosing, minlength=len(contours))
+        fragment = np.zeros(len(contours), dtype=bool)
+        fragment[nested] = (children[enclosing] == 1) & (area[nested] >= 0.2 * area[enclosing])
+        container = np.zeros(len(contours), dtype=bool)
+        container[grandparent[nested & ~fragment]] = True
+        keep = candidate & ~fragment & ~container
+        
+        x, y, w, h, area = x[keep], y[keep], w[keep], h[keep], area[keep]
+        
+        # Score by rectangularity: control interiors fill their box, background fragments don't
+        scores = np.clip(area / ((w - 1) * (h - 1)), 0, 1)
         
-        # Detect rectangular regions (potential buttons)
-        contours, _ = cv2.findContours(gray, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Hard cap on candidates so downstream classification cost stays bounded
+        if len(scores) > self.max_candidates:
+            top = np.argpartition(-scores, self.max_candidates)[:self.max_candidates]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
         
-        elements = []
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            if w > 50 and h > 20:  # Filter small regions
-                elements.append({
-                    'bounds': (x, y, w, h),
-                    'type': 'clickable',
-                    'confidence': 0.8
-                })
+        # Grow interiors back out over the outline stroke, clipped to the screen
+        x0, y0 = np.maximum(x - 2, 0), np.maximum(y - 2, 0)
+        x1, y1 = np.minimum(x + w + 2, width), np.minimum(y + h + 2, height)
         
-        return elements
+        return [{
+            'bounds': (int(x0[i]), int(y0[i]), int(x1[i] - x0[i]), int(y1[i] - y0[i])),
+            'type': 'clickable',
+            'confidence': float(scores[i])
+        } for i in top]
     
     def _combine_and_classify(self, text_regions: List[Dict], 
                             clickable_regions: List[Dict], 
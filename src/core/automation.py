@@ -1,12 +1,15 @@
 import cv2
+import threading
 import numpy as np
 from typing import List, Optional
 from .types import UIElement, WorkflowStep, ActionType
+from .resources import ResourceManager
+from .desktop import PyAutoGUIDesktop
 
 class LayoutAnalyzer:
-    def __init__(self):
+    def __init__(self, resource_manager: ResourceManager = None):
         from ..ai.vision import VisualProcessor
-        self.visual_processor = VisualProcessor()
+        self.visual_processor = VisualProcessor(resource_manager=resource_manager)
     
     def analyze(self, screenshot: np.ndarray) -> List[UIElement]:
         """Extract UI elements using OCR and CNN"""
@@ -26,31 +29,51 @@ class LayoutAnalyzer:
         return ui_elements
 
 class ElementMatcher:
-    def find_match(self, description: str, elements: List[UIElement]) -> Optional[UIElement]:
+    def __init__(self, resource_manager: ResourceManager = None):
+        self.resource_manager = resource_manager
+        self._semantic_matcher = None
+        self._load_lock = threading.Lock()
+    
+    @property
+    def semantic_matcher(self):
+        """Embedding model, loaded on first use and reused for every element"""
+        with self._load_lock:
+            if self._semantic_matcher is None:
+                from ..ai.language import SemanticMatcher
+                self._semantic_matcher = SemanticMatcher(resource_manager=self.resource_manager)
+        return self._semantic_matcher
+    
+    def find_match(self, description: str, elements: List[UIElement],
+                   description_embedding: Optional[np.ndarray] = None) -> Optional[UIElement]:
         # Semantic matching between description and UI elements
         best_match = None
         highest_score = 0
         
+        if description_embedding is None and elements:
+            description_embedding = self.semantic_matcher.encode_text(description)
+        
         for element in elements:
-            score = self._calculate_similarity(description, element)
+            score = self._calculate_similarity(description, element, description_embedding)
             if score > highest_score:
                 highest_score = score
                 best_match = element
         
         return best_match if highest_score > 0.7 else None
     
-    def _calculate_similarity(self, description: str, element: UIElement) -> float:
+    def _calculate_similarity(self, description: str, element: UIElement,
+                              description_embedding: Optional[np.ndarray] = None) -> float:
         """Calculate similarity between description and UI element"""
-        from ..ai.language import SemanticMatcher
-        
-        matcher = SemanticMatcher()
-        return matcher.calculate_similarity(
+        return self.semantic_matcher.calculate_similarity(
             description, 
             element.text_content, 
-            element.element_type
+            element.element_type,
+            desc_embedding=description_embedding
         )
 
 class ActionExecutor:
+    def __init__(self, desktop=None):
+        self.desktop = desktop or PyAutoGUIDesktop()
+    
     def execute_action(self, step: WorkflowStep, element: UIElement) -> bool:
         x, y, w, h = element.bounds
         center_x, center_y = x + w//2, y + h//2
@@ -66,27 +89,12 @@ class ActionExecutor:
     
     def _click(self, x: int, y: int) -> bool:
         """Execute mouse click"""
-        try:
-            import pyautogui
-            pyautogui.click(x, y)
-            return True
-        except Exception:
-            return False
+        return self.desktop.click(x, y)
     
     def _type_text(self, text: str) -> bool:
         """Type text using keyboard"""
-        try:
-            import pyautogui
-            pyautogui.typewrite(text)
-            return True
-        except Exception:
-            return False
+        return self.desktop.type_text(text)
     
     def _press_enter(self) -> bool:
         """Press enter key"""
-        try:
-            import pyautogui
-            pyautogui.press('enter')
-            return True
-        except Exception:
-            return False
\ No newline at end of file
+        return self.desktop.press('enter')
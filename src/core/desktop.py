@@ -0,0 +1,154 @@
+import os
+import select
+import subprocess
+import time
+import numpy as np
+from typing import List, Sequence, Tuple
+
+class PyAutoGUIDesktop:
+    """The display this process was started on, driven through pyautogui"""
+
+    def capture(self) -> np.ndarray:
+        import pyautogui
+        screenshot = pyautogui.screenshot()
+        return np.array(screenshot)
+
+    def click(self, x: int, y: int) -> bool:
+        try:
+            import pyautogui
+            pyautogui.click(x, y)
+            return True
+        except Exception:
+            return False
+
+    def type_text(self, text: str) -> bool:
+        try:
+            import pyautogui
+            pyautogui.typewrite(text)
+            return True
+        except Exception:
+            return False
+
+    def press(self, key: str) -> bool:
+        try:
+            import pyautogui
+            pyautogui.press(key)
+            return True
+        except Exception:
+            return False
+
+    def close(self):
+        pass
+
+class XvfbDesktop:
+    """Private Xvfb display, captured with Pillow and driven with xdotool.
+
+    pyautogui binds to a single X display per process, so each worker talks to
+    its own display through these per-call tools instead.
+    """
+
+    def __init__(self, display: int, size: Tuple[int, int] = (1280, 800), startup_timeout: float = 10.0):
+        self.display = f":{display}"
+        self.size = size
+        self.env = dict(os.environ, DISPLAY=self.display)
+        width, height = size
+
+        # Xvfb writes the display number to -displayfd once it accepts connections
+        ready_fd, write_fd = os.pipe()
+        try:
+            try:
+                self._process = subprocess.Popen(
+                    ['Xvfb', self.display, '-screen', '0', f'{width}x{height}x24', '-nolisten', 'tcp',
+                     '-displayfd', str(write_fd)],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, pass_fds=(write_fd,)
+                )
+            finally:
+                # Only Xvfb keeps the write end, so its exit shows up as end-of-file
+                os.close(write_fd)
+            self._wait_until_ready(ready_fd, startup_timeout)
+        finally:
+            os.close(ready_fd)
+
+    def _wait_until_ready(self, ready_fd: int, timeout: float):
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.close()
+                raise RuntimeError(f"Xvfb did not become ready on {self.display} within {timeout}s")
+
+            readable, _, _ = select.select([ready_fd], [], [], remaining)
+            if readable:
+                if os.read(ready_fd, 64):
+                    return
+                # Pipe closed without a display number: the server exited, e.g. display in use
+                code = self._process.wait()
+                raise RuntimeError(f"Xvfb failed to start on {self.display} (exit code {code}); "
+                                   f"is the display already in use?")
+
+    def capture(self) -> np.ndarray:
+        from PIL import ImageGrab
+        screenshot = ImageGrab.grab(xdisplay=self.display)
+        return np.array(screenshot.convert('RGB'))
+
+    def _xdotool(self, *args) -> bool:
+        try:
+            result = subprocess.run(['xdotool', *args], env=self.env, capture_output=True, timeout=10)
+            return result.returncode == 0
+        except Exception:
+            return False
+
+    def click(self, x: int, y: int) -> bool:
+        return self._xdotool('mousemove', str(x), str(y), 'click', '1')
+
+    def type_text(self, text: str) -> bool:
+        return self._xdotool('type', '--', text)
+
+    def press(self, key: str) -> bool:
+        return self._xdotool('key', 'Return' if key == 'enter' else key)
+
+    def close(self):
+        if self._process.poll() is None:
+            self._process.terminate()
+            self._process.wait()
+
+def draw_button(screen: np.ndarray, x: int, y: int, label: str,
+                width: int = 161, height: int = 41) -> Tuple[int, int, int, int]:
+    """Draw a filled, bordered, labelled button onto screen and return its box"""
+    import cv2
+
+    cv2.rectangle(screen, (x, y), (x + width - 1, y + height - 1), (200, 120, 40), -1)
+    cv2.rectangle(screen, (x, y), (x + width - 1, y + height - 1), (20, 20, 20), 1)
+    cv2.putText(screen, label, (x + 15, y + height - 13), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+    return (x, y, width, height)
+
+class SimulatedDesktop:
+    """In-memory screen of labelled buttons that records the actions sent to it"""
+
+    def __init__(self, labels: Sequence[str] = ("Search", "Play", "Send"),
+                 size: Tuple[int, int] = (1280, 800), latency: float = 0.0):
+        self.latency = latency
+        self.actions: List[Tuple] = []
+        width, height = size
+        self.screen = np.full((height, width, 3), 235, dtype=np.uint8)
+        self.buttons = [draw_button(self.screen, 80 + (i % 5) * 220, 80 + (i // 5) * 100, label)
+                        for i, label in enumerate(labels)]
+
+    def capture(self) -> np.ndarray:
+        time.sleep(self.latency)
+        return self.screen.copy()
+
+    def click(self, x: int, y: int) -> bool:
+        self.actions.append(('click', x, y))
+        return True
+
+    def type_text(self, text: str) -> bool:
+        self.actions.append(('type', text))
+        return True
+
+    def press(self, key: str) -> bool:
+        self.actions.append(('press', key))
+        return True
+
+    def close(self):
+        pass
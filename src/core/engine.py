@@ -3,14 +3,22 @@ import time
 from typing import List
 from .types import WorkflowStep, ActionType
 from .automation import LayoutAnalyzer, ElementMatcher, ActionExecutor
+from .resources import ResourceManager, get_resource_manager
+from .desktop import PyAutoGUIDesktop
 from ..ai.gemma import GemmaWorkflowGenerator
 
 class DesktopAutomationEngine:
-    def __init__(self):
-        self.layout_analyzer = LayoutAnalyzer()
-        self.element_matcher = ElementMatcher()
-        self.action_executor = ActionExecutor()
-        self.workflow_generator = GemmaWorkflowGenerator()
+    def __init__(self, resource_manager: ResourceManager = None, desktop=None,
+                 layout_analyzer: LayoutAnalyzer = None, element_matcher: ElementMatcher = None,
+                 workflow_generator: GemmaWorkflowGenerator = None, step_delay: float = 0.5):
+        # Models can be passed in so several engines share one loaded copy
+        self.resource_manager = resource_manager or get_resource_manager()
+        self.desktop = desktop or PyAutoGUIDesktop()
+        self.layout_analyzer = layout_analyzer or LayoutAnalyzer(resource_manager=self.resource_manager)
+        self.element_matcher = element_matcher or ElementMatcher(resource_manager=self.resource_manager)
+        self.action_executor = ActionExecutor(desktop=self.desktop)
+        self.workflow_generator = workflow_generator or GemmaWorkflowGenerator()
+        self.step_delay = step_delay
     
     def execute_prompt(self, prompt: str) -> bool:
         """Generate workflow from prompt and execute it"""
@@ -25,9 +33,7 @@ class DesktopAutomationEngine:
         return self.execute_workflow(workflow)
     
     def capture_screen(self) -> np.ndarray:
-        import pyautogui
-        screenshot = pyautogui.screenshot()
-        return np.array(screenshot)
+        return self.desktop.capture()
     
     def execute_workflow(self, workflow: List[WorkflowStep]) -> bool:
         """Execute workflow steps using OCR and CNN"""
@@ -38,12 +44,19 @@ class DesktopAutomationEngine:
                 time.sleep(step.timeout)
                 continue
             
+            # Embed the target description while the screen is captured and analyzed
+            description_future = self.resource_manager.submit(
+                'embedding', self.element_matcher.semantic_matcher.encode_text, step.target_description
+            )
+            
             # Capture screen and analyze UI elements
             screenshot = self.capture_screen()
             ui_elements = self.layout_analyzer.analyze(screenshot)
             
             # Find matching element
-            target_element = self.element_matcher.find_match(step.target_description, ui_elements)
+            target_element = self.element_matcher.find_match(
+                step.target_description, ui_elements, description_embedding=description_future.result()
+            )
             
             if not target_element:
                 print(f"Could not find element: {step.target_description}")
@@ -55,7 +68,7 @@ class DesktopAutomationEngine:
                 print(f"Failed to execute action: {step.action_type.value}")
                 return False
             
-            time.sleep(0.5)  # Brief pause between actions
+            time.sleep(self.step_delay)  # Brief pause between actions
         
         print("Workflow completed successfully")
         return True
\ No newline at end of file
@@ -0,0 +1,153 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List
+from .types import WorkflowStep
+from .automation import LayoutAnalyzer, ElementMatcher
+from .resources import ResourceManager
+from .desktop import XvfbDesktop, SimulatedDesktop
+from .engine import DesktopAutomationEngine
+from ..ai.gemma import GemmaWorkflowGenerator
+
+class AutomationPool:
+    """Runs queued workflows in parallel, one engine per display.
+
+    Workers are threads in one process, so every engine shares a single copy of
+    the vision and embedding models, the embedding cache, the workflow generator
+    and the resource manager. Each worker pulls the next queued job as soon as
+    it is free.
+    """
+
+    def __init__(self, desktops: List, resource_manager: ResourceManager = None, step_delay: float = 0.5):
+        self.desktops = desktops
+        self._owns_manager = resource_manager is None
+        self.resource_manager = resource_manager or ResourceManager(concurrency=len(desktops))
+        if self._owns_manager:
+            # The pool owns the process's workload, so its per-worker budgets set the library limits
+            self.resource_manager.configure()
+
+        # Read-only components loaded once and shared by every engine
+        layout_analyzer = LayoutAnalyzer(resource_manager=self.resource_manager)
+        element_matcher = ElementMatcher(resource_manager=self.resource_manager)
+        workflow_generator = GemmaWorkflowGenerator(max_concurrency=len(desktops))
+
+        self.engines = [
+            DesktopAutomationEngine(
+                resource_manager=self.resource_manager,
+                desktop=desktop,
+                layout_analyzer=layout_analyzer,
+                element_matcher=element_matcher,
+                workflow_generator=workflow_generator,
+                step_delay=step_delay
+            )
+            for desktop in desktops
+        ]
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self._busy = 0
+        self._completed = 0
+        self._succeeded = 0
+        self._started_at = time.perf_counter()
+        self._workers = [
+            threading.Thread(target=self._worker, args=(engine,), name=f"jarvis-display-{i}", daemon=True)
+            for i, engine in enumerate(self.engines)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @classmethod
+    def with_xvfb(cls, num_workers: int, first_display: int = 99, **kwargs) -> "AutomationPool":
+        """Pool with a fresh Xvfb display per worker"""
+        desktops = []
+        try:
+            for i in range(num_workers):
+                desktops.append(XvfbDesktop(first_display + i))
+        except Exception:
+            # Don't leave the displays that did start running
+            for desktop in desktops:
+                desktop.close()
+            raise
+        return cls(desktops, **kwargs)
+
+    @classmethod
+    def simulated(cls, num_workers: int, **kwargs) -> "AutomationPool":
+        """Pool backed by in-memory simulated desktops"""
+        return cls([SimulatedDesktop() for _ in range(num_workers)], **kwargs)
+
+    def submit(self, workflow: List[WorkflowStep]) -> Future:
+        """Queue a workflow; the future resolves to whether it completed"""
+        return self._enqueue(lambda engine: engine.execute_workflow(workflow))
+
+    def submit_prompt(self, prompt: str) -> Future:
+        """Queue a natural language prompt to generate and execute"""
+        return self._enqueue(lambda engine: engine.execute_prompt(prompt))
+
+    def _enqueue(self, run) -> Future:
+        future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new workflows after shutdown")
+            self._queue.put((run, future))
+        return future
+
+    def _worker(self, engine: DesktopAutomationEngine):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+
+            run, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            with self._lock:
+                self._busy += 1
+            try:
+                success = run(engine)
+                future.set_result(success)
+            except Exception as e:
+                success = False
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._busy -= 1
+                    self._completed += 1
+                    self._succeeded += int(success)
+
+    def stats(self) -> Dict:
+        """Worker occupancy and throughput since the pool started"""
+        elapsed = time.perf_counter() - self._started_at
+        with self._lock:
+            return {
+                'workers': len(self.engines),
+                'busy_workers': self._busy,
+                'queued': self._queue.qsize(),
+                'completed': self._completed,
+                'succeeded': self._succeeded,
+                'workflows_per_hour': self._completed / elapsed * 3600 if elapsed else 0.0,
+                'stages': self.resource_manager.stats()
+            }
+
+    def shutdown(self):
+        """Finish queued work, stop the workers and release their displays"""
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        for desktop in self.desktops:
+            desktop.close()
+        if self._owns_manager:
+            self.resource_manager.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
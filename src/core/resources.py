@@ -0,0 +1,177 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+# Stages that run PyTorch models; torch's thread count is one process-wide value
+TORCH_STAGES = ('cnn', 'embedding')
+
+@dataclass
+class StageBudget:
+    threads: int  # Intra-op threads (torch/OpenMP/OpenCV/Tesseract) for one task
+    workers: int = 1  # Tasks of this stage allowed to run at once
+
+@dataclass
+class StageStats:
+    submitted: int = 0
+    started: int = 0
+    completed: int = 0
+    wait_time: float = 0.0
+    busy_time: float = 0.0
+
+def default_budgets(cores: int, concurrency: int = 1) -> Dict[str, StageBudget]:
+    """Split cores between OCR, detection and embedding, which overlap within a step.
+    
+    concurrency is the number of engines sharing the manager; each stage gets that
+    many workers and each worker an equal slice of the stage's cores.
+    """
+    half = max(1, cores // 2 // concurrency)
+    quarter = max(1, cores // 4 // concurrency)
+    return {
+        'ocr': StageBudget(threads=half, workers=concurrency),
+        'detect': StageBudget(threads=quarter, workers=concurrency),
+        'cnn': StageBudget(threads=quarter, workers=concurrency),
+        'embedding': StageBudget(threads=quarter, workers=concurrency)
+    }
+
+class ResourceManager:
+    """Assigns CPU budgets to workload stages and runs them on bounded executors.
+    
+    Library thread limits are process-wide, so only the manager that owns the
+    process applies them: the default one, one passed to set_resource_manager, or
+    the one an AutomationPool creates for its workers.
+    """
+
+    def __init__(self, budgets: Optional[Dict[str, StageBudget]] = None, cores: Optional[int] = None,
+                 concurrency: int = 1):
+        self.cores = cores or os.cpu_count() or 1
+        self.budgets = budgets or default_budgets(self.cores, concurrency)
+        self._stats = {stage: StageStats() for stage in self.budgets}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._configured = False
+        self._started_at = time.perf_counter()
+        self._executors = {
+            stage: ThreadPoolExecutor(
+                max_workers=budget.workers,
+                thread_name_prefix=f"jarvis-{stage}",
+                initializer=self._init_worker,
+                initargs=(stage,)
+            )
+            for stage, budget in self.budgets.items()
+        }
+
+    def configure(self):
+        """Apply thread budgets process-wide to the libraries that would otherwise use every core"""
+        self._configured = True
+
+        # Tesseract runs as a subprocess and reads its OpenMP limit from the environment
+        os.environ['OMP_THREAD_LIMIT'] = str(self.threads('ocr'))
+
+        try:
+            import cv2
+            cv2.setNumThreads(self.threads('detect'))
+        except ImportError:
+            pass
+
+        try:
+            import torch
+            torch.set_num_threads(self.torch_threads())
+        except ImportError:
+            pass
+
+    def threads(self, stage: str) -> int:
+        budget = self.budgets.get(stage)
+        return budget.threads if budget else 1
+
+    def torch_threads(self) -> int:
+        return max(self.threads(stage) for stage in TORCH_STAGES)
+
+    def _init_worker(self, stage: str):
+        """Mark the thread's stage; torch workers of the owning manager re-assert its limit"""
+        self._local.stage = stage
+        if self._configured and stage in TORCH_STAGES:
+            try:
+                import torch
+                torch.set_num_threads(self.torch_threads())
+            except ImportError:
+                pass
+
+    def submit(self, stage: str, fn: Callable, *args, **kwargs) -> Future:
+        """Queue fn on the executor for stage"""
+        queued_at = time.perf_counter()
+        with self._lock:
+            self._stats[stage].submitted += 1
+
+        # Already on this stage's worker: run inline rather than deadlock the pool
+        if getattr(self._local, 'stage', None) == stage:
+            future = Future()
+            try:
+                future.set_result(self._run_task(stage, queued_at, fn, args, kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        return self._executors[stage].submit(self._run_task, stage, queued_at, fn, args, kwargs)
+
+    def run(self, stage: str, fn: Callable, *args, **kwargs):
+        """Run fn within the budget for stage and wait for its result"""
+        return self.submit(stage, fn, *args, **kwargs).result()
+
+    def _run_task(self, stage: str, queued_at: float, fn: Callable, args, kwargs):
+        started_at = time.perf_counter()
+        with self._lock:
+            self._stats[stage].started += 1
+            self._stats[stage].wait_time += started_at - queued_at
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            finished_at = time.perf_counter()
+            with self._lock:
+                self._stats[stage].completed += 1
+                self._stats[stage].busy_time += finished_at - started_at
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-stage queueing and utilization since the manager was created"""
+        elapsed = time.perf_counter() - self._started_at
+        report = {}
+        with self._lock:
+            for stage, stats in self._stats.items():
+                budget = self.budgets[stage]
+                report[stage] = {
+                    'threads': budget.threads,
+                    'workers': budget.workers,
+                    'submitted': stats.submitted,
+                    'queued': stats.submitted - stats.started,
+                    'running': stats.started - stats.completed,
+                    'completed': stats.completed,
+                    'avg_wait': stats.wait_time / stats.started if stats.started else 0.0,
+                    'avg_busy': stats.busy_time / stats.completed if stats.completed else 0.0,
+                    'utilization': stats.busy_time / (elapsed * budget.workers) if elapsed else 0.0
+                }
+        return report
+
+    def shutdown(self):
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
+
+_default_manager: Optional[ResourceManager] = None
+_default_lock = threading.Lock()
+
+def get_resource_manager() -> ResourceManager:
+    """Process-wide manager shared by every component not given its own"""
+    global _default_manager
+    with _default_lock:
+        if _default_manager is None:
+            _default_manager = ResourceManager()
+            _default_manager.configure()
+        return _default_manager
+
+def set_resource_manager(manager: ResourceManager):
+    """Make manager the process-wide default and apply its thread limits"""
+    global _default_manager
+    with _default_lock:
+        _default_manager = manager
+        manager.configure()
@@ -0,0 +1,151 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Shared fixtures for tests and run_benchmarks.py
+
+FAKE_WORKFLOW = [
+    {"action_type": "click", "target_description": "search"},
+    {"action_type": "type", "target_description": "search field", "value": "music"},
+    {"action_type": "enter", "target_description": "submit"}
+]
+
+class FakeOllamaServer:
+    """Local stand-in for the Ollama generate API with simulated model latency"""
+
+    def __init__(self, latency=0.05, fail_first=0, bad_prompts=()):
+        self.latency = latency
+        self.fail_first = fail_first
+        self.bad_prompts = bad_prompts  # Prompts answered with a malformed workflow
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, so pooled connections are reused
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                with server._lock:
+                    server.request_count += 1
+                    failing = server.request_count <= server.fail_first
+
+                time.sleep(server.latency)
+                status = 503 if failing else 200
+                bad = any(prompt in request["prompt"] for prompt in server.bad_prompts)
+                workflow = ["not a step"] if bad else FAKE_WORKFLOW
+                body = json.dumps({"response": json.dumps(workflow)}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+def render_synthetic_screen(seed=0, width=1280, height=800, num_buttons=12):
+    """Render a gradient screen with noisy panels and buttons, returning the button boxes"""
+    import cv2
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(40, 220, width, dtype=np.float32)
+    screen = np.repeat(np.tile(gradient, (height, 1))[:, :, None], 3, axis=2)
+    screen += rng.normal(0, 6, screen.shape)
+
+    # Textured panels, standing in for images and video thumbnails
+    for _ in range(4):
+        px, py = int(rng.integers(0, width - 300)), int(rng.integers(0, height - 200))
+        screen[py:py + 200, px:px + 300] = rng.integers(0, 255, (200, 300, 3))
+    screen = np.clip(screen, 0, 255).astype(np.uint8)
+
+    buttons = []
+    while len(buttons) < num_buttons:
+        w, h = int(rng.integers(80, 200)), int(rng.integers(28, 50))
+        x, y = int(rng.integers(0, width - w)), int(rng.integers(0, height - h))
+        if any(x < bx + bw + 10 and bx < x + w + 10 and y < by + bh + 10 and by < y + h + 10
+               for bx, by, bw, bh in buttons):
+            continue
+        color = tuple(int(c) for c in rng.integers(0, 255, 3))
+        cv2.rectangle(screen, (x, y), (x + w - 1, y + h - 1), color, -1)
+        cv2.rectangle(screen, (x, y), (x + w - 1, y + h - 1), (20, 20, 20), 1)
+        cv2.putText(screen, "OK", (x + 10, y + h - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        buttons.append((x, y, w, h))
+
+    return screen, buttons
+
+def box_iou(a, b) -> float:
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = ix * iy
+    return inter / float(aw * ah + bw * bh - inter)
+
+def render_labelled_screen(labels, width=1280, height=800):
+    """Render a plain screen with a row of labelled buttons, returning the button boxes"""
+    from src.core.desktop import SimulatedDesktop
+
+    desktop = SimulatedDesktop(labels, size=(width, height))
+    return desktop.screen, desktop.buttons
+
+def render_container_screen(kind, width=1280, height=800):
+    """Render buttons inside a bordered dialog or toolbar, returning the button boxes"""
+    import cv2
+    import numpy as np
+    from src.core.desktop import draw_button
+
+    screen = np.full((height, width, 3), 235, dtype=np.uint8)
+    if kind == "dialog":
+        cv2.rectangle(screen, (300, 200), (900, 500), (255, 255, 255), -1)
+        cv2.rectangle(screen, (300, 200), (900, 500), (60, 60, 60), 1)
+        cv2.putText(screen, "Save changes?", (330, 250), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (30, 30, 30), 2)
+        buttons = [draw_button(screen, 520, 430, "OK", 150, 40),
+                   draw_button(screen, 720, 430, "Cancel", 150, 40)]
+    else:
+        cv2.rectangle(screen, (100, 40), (1000, 110), (215, 215, 215), -1)
+        cv2.rectangle(screen, (100, 40), (1000, 110), (60, 60, 60), 1)
+        buttons = [draw_button(screen, 120 + i * 220, 50, label, 150, 50)
+                   for i, label in enumerate(["New", "Open", "Save", "Print"])]
+    return screen, buttons
+
+def write_fake_xvfb(directory, fail=False):
+    """Write an Xvfb stand-in that reports ready on -displayfd, or exits as if the display were taken"""
+    import os
+    import sys
+
+    path = os.path.join(directory, "Xvfb")
+    with open(path, "w") as f:
+        f.write(f"""#!{sys.executable}
+import os, sys, time
+if {fail!r}:
+    sys.exit(1)
+args = sys.argv[1:]
+os.write(int(args[args.index("-displayfd") + 1]), args[0].lstrip(":").encode() + b"\\n")
+time.sleep(60)
+""")
+    os.chmod(path, 0o755)
+    return path
@@ -8,6 +8,7 @@ import numpy as np
 from src.ai.vision import VisualProcessor
 from src.ai.gemma import GemmaWorkflowGenerator
 from src.core.engine import DesktopAutomationEngine
+from src.core.resources import ResourceManager
 
 def test_screenshot_capture():
     """Test screenshot capture functionality"""
@@ -41,6 +42,40 @@ def test_element_detection():
         print(f"✗ Element detection failed: {e}")
         return False
 
+def test_clickable_detection():
+    """Test clickable detector recall, precision and candidate cap on synthetic screens"""
+    try:
+        from tests.helpers import render_synthetic_screen, render_labelled_screen, render_container_screen, box_iou
+        
+        processor = VisualProcessor(max_candidates=20)
+        screen, buttons = render_synthetic_screen(seed=0)
+        
+        elements = processor._detect_clickable_elements(screen)
+        found = sum(any(box_iou(button, e['bounds']) > 0.5 for e in elements) for button in buttons)
+        
+        assert len(elements) <= 20, "Should cap candidate count"
+        assert found / len(buttons) >= 0.8, "Should find rendered buttons"
+        
+        # Sparse screens must not surface the outline mask or label-split fragments
+        sparse_screen, sparse_buttons = render_labelled_screen(["Search", "Play", "Send"])
+        sparse_elements = processor._detect_clickable_elements(sparse_screen)
+        
+        assert len(sparse_elements) == len(sparse_buttons), "Should return exactly one candidate per button"
+        assert all(any(box_iou(button, e['bounds']) > 0.8 for e in sparse_elements) for button in sparse_buttons)
+        
+        # Controls inside a dialog or toolbar are returned instead of their container
+        for kind in ("dialog", "toolbar"):
+            nested_screen, nested_buttons = render_container_screen(kind)
+            nested_elements = processor._detect_clickable_elements(nested_screen)
+            
+            assert len(nested_elements) == len(nested_buttons), f"Should return only the {kind} buttons"
+            assert all(any(box_iou(button, e['bounds']) > 0.8 for e in nested_elements) for button in nested_buttons)
+        print(f"✓ Clickable detection working ({found}/{len(buttons)} buttons)")
+        return True
+    except Exception as e:
+        print(f"✗ Clickable detection failed: {e}")
+        return False
+
 def test_workflow_generation():
     """Test Gemma workflow generation"""
     try:
@@ -61,6 +96,274 @@ def test_workflow_generation():
         print(f"✗ Workflow generation failed: {e}")
         return False
 
+def test_batch_workflow_generation():
+    """Test concurrent batch generation with deduplication and retries"""
+    try:
+        from tests.helpers import FakeOllamaServer
+        
+        with FakeOllamaServer(latency=0.01, fail_first=1) as server:
+            generator = GemmaWorkflowGenerator(ollama_url=server.url, backoff_base=0.01)
+            prompts = ["Play music on Spotify", "Send email", "Play music on Spotify"]
+            
+            results = dict(generator.generate_workflows(prompts))
+            
+            assert set(results) == {"Play music on Spotify", "Send email"}, "Should yield each prompt once"
+            assert all(len(workflow) == 3 for workflow in results.values()), "Should parse every workflow"
+            assert server.request_count == 3, "Should dedupe prompts and retry the failed request"
+        
+        # Concurrent batches sharing a prompt share its in-flight request
+        with FakeOllamaServer(latency=0.3) as server:
+            import threading
+            
+            generator = GemmaWorkflowGenerator(ollama_url=server.url)
+            barrier = threading.Barrier(2)
+            batch_results = {}
+            
+            def run_batch(name, prompts):
+                barrier.wait()
+                batch_results[name] = dict(generator.generate_workflows(prompts))
+            
+            threads = [
+                threading.Thread(target=run_batch, args=("first", ["Play music on Spotify", "Send email"])),
+                threading.Thread(target=run_batch, args=("second", ["Play music on Spotify", "Search web"]))
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            
+            assert server.request_count == 3, "Shared prompt should be requested once across batches"
+            assert all(len(results["Play music on Spotify"]) == 3 for results in batch_results.values())
+        
+        # A malformed workflow for one prompt leaves the rest of the batch intact
+        with FakeOllamaServer(latency=0.01, bad_prompts=["Send email"]) as server:
+            generator = GemmaWorkflowGenerator(ollama_url=server.url)
+            results = dict(generator.generate_workflows(["Play music on Spotify", "Send email", "Search web"]))
+            
+            assert results["Send email"] == [], "Malformed workflow should give an empty result"
+            assert len(results["Play music on Spotify"]) == 3 and len(results["Search web"]) == 3
+        
+        # A raising prompt yields an empty workflow instead of ending the batch
+        generator = GemmaWorkflowGenerator()
+        generator.generate_workflow = lambda prompt: 1 / 0 if prompt == "b" else []
+        results = dict(generator.generate_workflows(["a", "b", "c"]))
+        assert results == {"a": [], "b": [], "c": []}, "Should keep going after a failure"
+        
+        print("✓ Batch workflow generation working")
+        return True
+    except Exception as e:
+        print(f"✗ Batch workflow generation failed: {e}")
+        return False
+
+def test_resource_manager():
+    """Test stage budgets, concurrent stages and per-stage stats"""
+    try:
+        import time
+        
+        import cv2
+        
+        omp_limit = os.environ.get('OMP_THREAD_LIMIT')
+        cv2_threads = cv2.getNumThreads()
+        
+        manager = ResourceManager(cores=4)
+        assert manager.threads('ocr') == 2, "OCR should get half the cores"
+        assert os.environ.get('OMP_THREAD_LIMIT') == omp_limit, "Only configure() should touch process limits"
+        
+        try:
+            manager.configure()
+            assert os.environ['OMP_THREAD_LIMIT'] == '2', "Tesseract should get the OCR budget"
+            assert cv2.getNumThreads() == 1, "OpenCV should get the detection budget"
+        finally:
+            if omp_limit is None:
+                os.environ.pop('OMP_THREAD_LIMIT', None)
+            else:
+                os.environ['OMP_THREAD_LIMIT'] = omp_limit
+            cv2.setNumThreads(cv2_threads)
+        
+        # Independent stages overlap instead of running back to back
+        start = time.perf_counter()
+        ocr = manager.submit('ocr', time.sleep, 0.2)
+        detect = manager.submit('detect', time.sleep, 0.2)
+        ocr.result()
+        detect.result()
+        assert time.perf_counter() - start < 0.35, "OCR and detection should run concurrently"
+        
+        # Nested work on the same stage runs inline rather than deadlocking
+        assert manager.run('embedding', manager.run, 'embedding', len, "abc") == 3
+        
+        stats = manager.stats()
+        assert stats['ocr']['completed'] == 1 and stats['ocr']['queued'] == 0
+        assert stats['embedding']['submitted'] == stats['embedding']['completed'] == 2, "Inline runs should be counted"
+        assert stats['embedding']['queued'] == stats['embedding']['running'] == 0
+        assert stats['embedding']['avg_busy'] > 0
+        assert 0 < stats['detect']['utilization'] <= 1
+        manager.shutdown()
+        
+        print("✓ Resource manager working")
+        return True
+    except Exception as e:
+        print(f"✗ Resource manager failed: {e}")
+        return False
+
+def test_embedding_cache():
+    """Test the shared embedding cache across threads and its LRU bound"""
+    try:
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        from src.ai.language import SemanticMatcher, EmbeddingCache
+        
+        class CountingMatcher(SemanticMatcher):
+            """Encodes text as its length instead of loading the embedding model"""
+            def __init__(self, cache_size):
+                self.resource_manager = ResourceManager(cores=2)
+                self.cache = EmbeddingCache(cache_size)
+                self.encoded = []
+                self._lock = threading.Lock()
+            
+            def _encode(self, text):
+                with self._lock:
+                    self.encoded.append(text)
+                return np.array([len(text), 1.0])
+        
+        matcher = CountingMatcher(cache_size=8)
+        texts = ["button Search", "input Query", "button Play"] * 20
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            embeddings = list(executor.map(matcher.encode_text, texts))
+        
+        assert all(embedding[0] == len(text) for text, embedding in zip(texts, embeddings))
+        assert len(matcher.cache) == 3, "Should cache each distinct text once"
+        
+        encoded = len(matcher.encoded)
+        matcher.calculate_similarity("Search", "Search", "button")
+        assert len(matcher.encoded) == encoded + 1, "Only the new description should be encoded"
+        
+        try:
+            matcher.encode_text("button Play")[0] = 0
+            assert False, "Cached embeddings should be read-only"
+        except ValueError:
+            pass
+        
+        # Least recently used entries are evicted once the cache is full
+        small = CountingMatcher(cache_size=2)
+        for text in ["a", "b", "a", "c", "a", "b"]:
+            small.encode_text(text)
+        assert small.encoded == ["a", "b", "c", "b"], "Should keep the recently used entry"
+        small.resource_manager.shutdown()
+        matcher.resource_manager.shutdown()
+        
+        print(f"✓ Embedding cache working ({matcher.cache.hits} hits, {matcher.cache.misses} misses)")
+        return True
+    except Exception as e:
+        print(f"✗ Embedding cache failed: {e}")
+        return False
+
+def test_automation_pool():
+    """Test dispatching queued workflows across simulated displays"""
+    try:
+        import time
+        import types
+        from src.core.pool import AutomationPool
+        from src.core.automation import ElementMatcher
+        from src.core.desktop import SimulatedDesktop
+        from src.core.types import WorkflowStep, ActionType
+        
+        import cv2
+        
+        workflow = [WorkflowStep(ActionType.WAIT, "page to load", timeout=1)]
+        omp_limit = os.environ.pop('OMP_THREAD_LIMIT', None)
+        cv2_threads = cv2.getNumThreads()
+        
+        try:
+            with AutomationPool.simulated(2, step_delay=0) as pool:
+                # A pool that creates its own manager applies its per-worker budgets
+                assert os.environ.get('OMP_THREAD_LIMIT') == str(pool.resource_manager.threads('ocr'))
+                assert cv2.getNumThreads() == pool.resource_manager.threads('detect')
+                assert pool.engines[0].layout_analyzer is pool.engines[1].layout_analyzer, "Engines should share models"
+                
+                start = time.perf_counter()
+                futures = [pool.submit(workflow) for _ in range(4)]
+                assert all(future.result() for future in futures), "Workflows should succeed"
+                assert time.perf_counter() - start < 3, "Two workers should split four workflows"
+                assert pool.stats()['completed'] == 4
+            
+            # Actions reach each worker's own display through capture, analysis and matching
+            workflow = [
+                WorkflowStep(ActionType.CLICK, "Search button"),
+                WorkflowStep(ActionType.TYPE, "search input", value="cello music"),
+                WorkflowStep(ActionType.ENTER, "submit search")
+            ]
+            class FirstElementMatcher(ElementMatcher):
+                """Skips the embedding model and picks the first detected element"""
+                def __init__(self):
+                    super().__init__()
+                    self._semantic_matcher = types.SimpleNamespace(encode_text=lambda text: None)
+            
+                def find_match(self, description, elements, description_embedding=None):
+                    return elements[0] if elements else None
+            
+            desktops = [SimulatedDesktop(latency=0.2) for _ in range(2)]
+            pool = AutomationPool(desktops, step_delay=0)
+            matcher = FirstElementMatcher()
+            for engine in pool.engines:
+                engine.element_matcher = matcher
+            
+            futures = [pool.submit(workflow) for _ in range(4)]
+            assert all(future.result(timeout=60) for future in futures), "Workflows should succeed"
+            pool.shutdown()
+            
+            assert all(desktop.actions for desktop in desktops), "Every display should receive actions"
+            assert sum(len(desktop.actions) for desktop in desktops) == 12, "Each step should dispatch one action"
+            assert [action[0] for action in desktops[0].actions[:3]] == ['click', 'type', 'press']
+        finally:
+            if omp_limit is None:
+                os.environ.pop('OMP_THREAD_LIMIT', None)
+            else:
+                os.environ['OMP_THREAD_LIMIT'] = omp_limit
+            cv2.setNumThreads(cv2_threads)
+        
+        try:
+            pool.submit(workflow)
+            assert False, "Submitting after shutdown should fail"
+        except RuntimeError:
+            pass
+        
+        print("✓ Automation pool working")
+        return True
+    except Exception as e:
+        print(f"✗ Automation pool failed: {e}")
+        return False
+
+def test_xvfb_desktop():
+    """Test Xvfb startup readiness and failure detection with a stand-in server"""
+    try:
+        import tempfile
+        from src.core.desktop import XvfbDesktop
+        from tests.helpers import write_fake_xvfb
+        
+        path = os.environ['PATH']
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                write_fake_xvfb(directory)
+                os.environ['PATH'] = directory + os.pathsep + path
+                desktop = XvfbDesktop(99, startup_timeout=5)
+                assert desktop._process.poll() is None, "Server should be running once ready"
+                desktop.close()
+                
+                write_fake_xvfb(directory, fail=True)
+                try:
+                    XvfbDesktop(99, startup_timeout=5)
+                    assert False, "Should raise when Xvfb exits during startup"
+                except RuntimeError:
+                    pass
+            finally:
+                os.environ['PATH'] = path
+        
+        print("✓ Xvfb desktop working")
+        return True
+    except Exception as e:
+        print(f"✗ Xvfb desktop failed: {e}")
+        return False
+
 def test_automation_engine():
     """Test the main automation engine"""
     try:
@@ -82,7 +385,13 @@ if __name__ == "__main__":
     tests = [
         test_screenshot_capture,
         test_element_detection,
+        test_clickable_detection,
         test_workflow_generation,
+        test_batch_workflow_generation,
+        test_resource_manager,
+        test_embedding_cache,
+        test_automation_pool,
+        test_xvfb_desktop,
         test_automation_engine
     ]
     